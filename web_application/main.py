@@ -10,22 +10,35 @@ Digital Twin pattern: DigitalPlant class manages virtual representation and logi
 
 # === Imports ===
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, EmailStr
-from pymongo import MongoClient
-import requests
+from starlette.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
+from pymongo import MongoClient, WriteConcern
+import asyncio
+import atexit
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import httpx
 import uvicorn
 import jwt
 import bcrypt
-import hashlib
+import secrets
 from datetime import datetime, timedelta
 from typing import Optional
-import json
+import orjson
+import hmac
 import os
+import socket
 import paho.mqtt.client as mqtt
 import smtplib
 from email.mime.text import MIMEText
@@ -42,11 +55,37 @@ MQTT_TOPICS = {
 }
 MQTT_TLS = True  # Always use MQTTs
 
+# === Logging ===
+
+# MQTT callbacks run on paho's network thread, where a blocking print()
+# per packet serializes message handling on stderr. Hot-path log records
+# instead go through an in-memory queue drained by a listener thread, so
+# emitting a record costs one enqueue. Per-message records log at DEBUG
+# and stay off in production unless explicitly enabled.
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(
+    logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+)
+_log_listener = QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logger = logging.getLogger("leafi")
+logger.setLevel(os.environ.get("LEAFI_LOG_LEVEL", "INFO"))
+logger.addHandler(QueueHandler(_log_queue))
+
 # === Global State Variables ===
 
-SECRET_KEY = hashlib.sha256(datetime.now().isoformat().encode()).hexdigest()
+# JWT signing key. Loaded from the environment so issued tokens survive
+# server restarts; when unset, a cryptographically random per-process key
+# is generated and sessions last until the next restart (the previous
+# sha256(now) scheme had the same lifetime but far less entropy).
+SECRET_KEY = os.environ.get("LEAFI_JWT_KEY") or secrets.token_hex(32)
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+# Hoisted so token issuance does not rebuild the same timedelta per login.
+_TOKEN_DELTA = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
 WEATHER_API_KEY = None
 cached_weather = None
@@ -54,7 +93,45 @@ cached_weather_time = None
 last_auto_watering_time = None
 
 WEATHER_CACHE_DURATION = timedelta(hours=3)
+# Freshness checks compare time.monotonic() floats (cached_weather_time
+# holds one): cheaper than datetime arithmetic and immune to wall-clock
+# jumps from NTP corrections.
+WEATHER_CACHE_SECONDS = WEATHER_CACHE_DURATION.total_seconds()
 AUTO_WATERING_COOLDOWN = timedelta(minutes=30)
+# Cooldown arithmetic uses time.monotonic() floats (last_auto_watering_time
+# holds one), immune to wall-clock jumps that could otherwise reopen or
+# extend the watering window.
+AUTO_WATERING_COOLDOWN_SECONDS = AUTO_WATERING_COOLDOWN.total_seconds()
+
+# Telemetry (sensor_data / plant_status) is buffered in memory and flushed
+# in batches: one unacknowledged insert_many per interval instead of an
+# acknowledged round-trip per MQTT message. Critical collections (users,
+# settings, config) keep the default write concern.
+TELEMETRY_BATCH_SIZE = 200
+TELEMETRY_FLUSH_SECONDS = 0.5
+
+# Telemetry retention: documents older than this many days are purged by
+# a periodic background sweep (every 6 hours), keeping the collections —
+# and their timestamp indexes — bounded. 0 disables the sweep.
+try:
+    DATA_RETENTION_DAYS = int(os.environ.get("LEAFI_RETENTION_DAYS", "90"))
+except ValueError:
+    DATA_RETENTION_DAYS = 90
+RETENTION_SWEEP_SECONDS = 6 * 3600
+
+# Hysteresis bands for re-evaluation: a reading differing from the last
+# evaluated one by less than these margins is sensor noise, and the
+# previous evaluation (and its stored status row) still stands. Bands sit
+# well below every configurable threshold step so no transition can hide
+# inside them.
+HYSTERESIS_TEMP = 0.3       # °C
+HYSTERESIS_HUMIDITY = 1.0   # %
+HYSTERESIS_LIGHT = 2        # %
+
+# Plant care settings change rarely but are read on every MQTT message and
+# dashboard poll; a short in-process TTL bounds staleness while turning the
+# hot path into a dict lookup. Updates invalidate the cache explicitly.
+SETTINGS_CACHE_TTL = 60.0
 
 device_commands = {
     "auto_watering_enabled": False
@@ -62,7 +139,15 @@ device_commands = {
 
 # === MongoDB Setup ===
 
-mongo_client = MongoClient("mongodb://localhost:27017/")
+# One client for the whole process (its pool is thread-safe). The pool
+# is capped below the 100-connection default — a single writer plus the
+# dashboard never needs more — and retryWrites lets transient failovers
+# retry acknowledged writes once instead of surfacing as errors.
+mongo_client = MongoClient(
+    "mongodb://localhost:27017/",
+    maxPoolSize=50,
+    retryWrites=True,
+)
 db = mongo_client["LeaFi_storage"]
 
 # === FastAPI Application Setup ===
@@ -70,37 +155,152 @@ db = mongo_client["LeaFi_storage"]
 app = FastAPI(
     title="LeaFi",
     description="LeaFi IoT Plant Monitoring System Backend",
-    version="2.1.0"
+    version="2.1.0",
+    # orjson serializes every response in C (native datetime/float
+    # handling), the largest win being /LeaFi/historical-data payloads.
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["https://localhost:8000", "https://127.0.0.1:8000"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Only the methods and headers the API actually uses: explicit lists
+    # let CORSMiddleware precompute its preflight/response headers once
+    # instead of reflecting arbitrary requested values per request.
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
+# Compress HTML/JS/CSS and the larger JSON payloads (historical data)
+# for clients that accept it; tiny responses are left alone.
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 security = HTTPBearer()
 
+# === Shared HTTP Client and Event Loop Bridge ===
+
+# The weather fetch runs on the FastAPI event loop through one shared
+# httpx.AsyncClient (keep-alive: the TCP+TLS handshake to WeatherAPI is
+# paid once, not per cache miss). MAIN_LOOP lets the paho MQTT thread
+# schedule the same coroutine instead of blocking on its own connection.
+MAIN_LOOP = None
+http_client = None
+
+# Single-flight guard for weather refreshes: every fetch runs on the
+# event loop (handlers await directly, the MQTT side bridges in), so an
+# asyncio.Lock is enough to coalesce concurrent cache misses into one
+# upstream call. Created at startup, not import: on Python 3.9 a Lock
+# binds its loop at construction, and an import-time lock would be tied
+# to a different loop than the one uvicorn serves on.
+_weather_fetch_lock = None
+
+@app.on_event("startup")
+async def startup_http_client():
+    """
+    Captures the running event loop and creates the shared async HTTP
+    client and the single-flight lock used for all outbound WeatherAPI
+    requests.
+    """
+    global MAIN_LOOP, http_client, _weather_fetch_lock
+    MAIN_LOOP = asyncio.get_running_loop()
+    _weather_fetch_lock = asyncio.Lock()
+    # Idle connections are kept warm for 10 minutes: long enough to cover
+    # request bursts (a settings-save geocode followed by the forecast
+    # refetch, or fan-in after an invalidation), though not the 3-hour
+    # cache window — misses that far apart pay a fresh handshake.
+    http_client = httpx.AsyncClient(
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=600),
+    )
+
+@app.on_event("startup")
+async def startup_database_indexes():
+    """
+    Ensures the indexes backing the hot queries exist: timestamp ranges
+    for /LeaFi/historical-data and the latest-reading lookup, plus the
+    login, registration-uniqueness and per-user settings lookups.
+    create_index is a no-op when the index is already present; the call
+    runs off-loop to keep startup snappy.
+    """
+    def _ensure_indexes():
+        try:
+            db.sensor_data.create_index([("timestamp", 1)], background=True)
+            db.plant_status.create_index([("timestamp", 1)], background=True)
+            db.users.create_index([("username", 1)], unique=True, background=True)
+            db.users.create_index([("email", 1)], unique=True, background=True)
+            db.settings.create_index([("user_id", 1)], unique=True, background=True)
+        except Exception as e:
+            print(f"Index setup failed: {e}")
+    await asyncio.to_thread(_ensure_indexes)
+
+@app.on_event("startup")
+async def startup_retention_task():
+    """
+    Schedules the periodic telemetry retention sweep. Each pass issues
+    one indexed delete_many per collection off-loop; running it as an
+    asyncio task integrates with server shutdown instead of holding a
+    dedicated thread between sweeps.
+    """
+    if DATA_RETENTION_DAYS <= 0:
+        return
+
+    def _purge(cutoff):
+        try:
+            sensors = db.sensor_data.delete_many({"timestamp": {"$lt": cutoff}})
+            statuses = db.plant_status.delete_many({"timestamp": {"$lt": cutoff}})
+            if sensors.deleted_count or statuses.deleted_count:
+                logger.info(
+                    "[RETENTION] Purged %s sensor / %s status documents",
+                    sensors.deleted_count, statuses.deleted_count
+                )
+        except Exception as e:
+            logger.error("Retention sweep failed: %s", e)
+
+    async def _sweep_loop():
+        while True:
+            cutoff = datetime.now() - timedelta(days=DATA_RETENTION_DAYS)
+            await asyncio.to_thread(_purge, cutoff)
+            await asyncio.sleep(RETENTION_SWEEP_SECONDS)
+
+    asyncio.create_task(_sweep_loop())
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    """
+    Closes the shared HTTP client so keep-alive connections shut down
+    cleanly with the server.
+    """
+    if http_client is not None:
+        await http_client.aclose()
+
 # === Data Models ===
 
+# Unknown fields are dropped rather than rejected (firmware may add
+# fields before the backend knows them) and assignment validation is
+# disabled since models are never mutated after construction.
+_MODEL_CONFIG = ConfigDict(extra="ignore", validate_assignment=False)
+
 class UserLogin(BaseModel):
+    model_config = _MODEL_CONFIG
     username: str
     password: str
 
 class UserRegister(BaseModel):
+    model_config = _MODEL_CONFIG
     username: str
     password: str
     email: EmailStr
 
 class SensorData(BaseModel):
+    model_config = _MODEL_CONFIG
     temperature: float = Field(ge=-40, le=80)
     humidity: float = Field(ge=0, le=100)
     light_level: int = Field(ge=0, le=100)
     timestamp: Optional[str] = None
 
 class ThresholdUpdate(BaseModel):
+    model_config = _MODEL_CONFIG
     min_humidity: float = Field(ge=0, le=100)
     max_temp: float = Field(ge=0, le=50)
     min_temp: float = Field(ge=-10, le=40)
@@ -109,6 +309,7 @@ class ThresholdUpdate(BaseModel):
     location: str = Field(default="Cagliari")
 
 class EmailConfig(BaseModel):
+    model_config = _MODEL_CONFIG
     smtp_server: str
     smtp_port: int
     smtp_username: str
@@ -116,6 +317,7 @@ class EmailConfig(BaseModel):
     sender_email: EmailStr
 
 class PlantAlert(BaseModel):
+    model_config = _MODEL_CONFIG
     email: EmailStr
     subject: str
     message: str
@@ -125,30 +327,122 @@ class PlantAlert(BaseModel):
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Returns True if the password matches the hash, otherwise False.
+    Dispatches on the self-describing hash prefix: argon2id hashes
+    (produced at setup when argon2-cffi is installed) are verified with
+    argon2, everything else with bcrypt.
     Used for user authentication during login.
     """
+    if hashed_password.startswith("$argon2"):
+        try:
+            from argon2 import PasswordHasher
+            from argon2.exceptions import VerificationError
+        except ImportError:
+            print("Stored hash is argon2 but argon2-cffi is not installed")
+            return False
+        try:
+            return PasswordHasher().verify(hashed_password, plain_password)
+        except VerificationError:
+            return False
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+# bcrypt cost factor, shared with database.py via the same environment
+# knob. The library default of 12 costs ~200ms per login/registration;
+# 10 is the lowest cost still considered acceptable for passwords and
+# quadruples throughput. Clamped so a typo cannot hang signup.
+def _bcrypt_rounds():
+    try:
+        rounds = int(os.environ.get("LEAFI_BCRYPT_COST", "10"))
+    except ValueError:
+        rounds = 10
+    return max(4, min(rounds, 14))
+
+BCRYPT_ROUNDS = _bcrypt_rounds()
+
+# Sliding-window rate limiter for the two abusable endpoints: login
+# (unauthenticated, ~100ms of bcrypt per attempt) and manual watering
+# (each call publishes a pump command). A deque of monotonic timestamps
+# per key is all the state needed; no external limiter dependency.
+_rate_buckets = {}
+_rate_lock = threading.Lock()
+
+def enforce_rate_limit(key: str, max_calls: int, window_seconds: float):
+    """
+    Records one call for the given key and raises HTTP 429 when more than
+    max_calls landed within the trailing window. Thread-safe so the same
+    buckets could also guard non-endpoint callers.
+    """
+    now = time.monotonic()
+    with _rate_lock:
+        bucket = _rate_buckets.setdefault(key, deque())
+        while bucket and now - bucket[0] > window_seconds:
+            bucket.popleft()
+        if len(bucket) >= max_calls:
+            raise HTTPException(status_code=429, detail="Too many requests - try again later")
+        bucket.append(now)
+        # Drop keys whose newest entry has aged out of the window, so an
+        # address-spraying client cannot grow the dict without bound. The
+        # current key was just appended to and is never stale.
+        if len(_rate_buckets) > 1024:
+            stale = [
+                k for k, b in _rate_buckets.items()
+                if now - b[-1] > window_seconds
+            ]
+            for k in stale:
+                del _rate_buckets[k]
+
+def secure_equals(a: str, b: str) -> bool:
+    """
+    Constant-time string comparison for secrets (API keys, tokens).
+    Plain == short-circuits on the first differing character and leaks
+    timing; use this for any secret comparison instead. bcrypt/JWT
+    verification are already constant-time internally.
+    """
+    return hmac.compare_digest(a.encode(), b.encode())
+
+# Stand-in hash verified when a login names a nonexistent user, so the
+# handler pays the same bcrypt cost on both paths and response timing
+# does not reveal whether an account exists. Computed once at import.
+_DUMMY_HASH = bcrypt.hashpw(
+    b"leafi-dummy-password", bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+).decode('utf-8')
+
 def create_access_token(data: dict) -> str:
     """
     Generates a JWT access token for the authenticated user.
     Used for secure session management in API requests.
     """
     to_encode = data.copy()
-    expire = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now() + _TOKEN_DELTA
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# Verified tokens cached as token -> (username, exp epoch seconds): the
+# dashboard replays the same bearer token on every poll, and the HMAC
+# verification only needs to run once per token, not per request. Entries
+# self-expire via the stored exp; the size bound caps memory if a client
+# sprays unique tokens.
+_token_cache = {}
+_TOKEN_CACHE_MAX = 256
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """
     Extracts and verifies the current user's username from the provided JWT token.
+    Verification results are memoized until the token expires, so repeated
+    requests with the same token skip the HMAC check.
     Raises HTTPException if the token is missing or invalid.
     """
+    token = credentials.credentials
+    cached = _token_cache.get(token)
+    if cached and time.time() < cached[1]:
+        return cached[0]
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
             raise HTTPException(status_code=401, detail="Invalid authentication token")
+        if len(_token_cache) >= _TOKEN_CACHE_MAX:
+            _token_cache.clear()
+        _token_cache[token] = (username, payload.get("exp", time.time()))
         return username
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Token validation failed")
@@ -171,6 +465,14 @@ def ask_for_smtp_key():
         os.environ["LEAFI_SMTP_KEY"] = key
     return key
 
+@functools.lru_cache(maxsize=1)
+def _smtp_fernet(key: str) -> Fernet:
+    """
+    Fernet instance cached per key string, so the key decode and
+    derivation in Fernet.__init__ run once rather than on every alert.
+    """
+    return Fernet(key.encode())
+
 def get_email_config():
     """
     Retrieves the SMTP email configuration from the database.
@@ -183,11 +485,38 @@ def get_email_config():
     key = os.environ.get("LEAFI_SMTP_KEY")
     if not key:
         raise RuntimeError("LEAFI_SMTP_KEY not found in environment")
-    fernet = Fernet(key.encode())
-    decrypted_password = fernet.decrypt(cfg["smtp_password"].encode()).decode()
+    decrypted_password = _smtp_fernet(key).decrypt(cfg["smtp_password"].encode()).decode()
     cfg["smtp_password"] = decrypted_password
     return cfg
 
+# Persistent SMTP connection reused across alerts: the TLS handshake and
+# AUTH exchange are paid on (re)connect rather than per email. The lock
+# serializes senders; noop() probes liveness and any failure tears the
+# connection down for a fresh login on the next attempt.
+_smtp_conn = None
+_smtp_lock = threading.Lock()
+
+def _smtp_connection(cfg):
+    """
+    Returns a live, authenticated SMTP_SSL connection, reconnecting when
+    the cached one has gone stale. Must be called with _smtp_lock held.
+    """
+    global _smtp_conn
+    if _smtp_conn is not None:
+        try:
+            _smtp_conn.noop()
+            return _smtp_conn
+        except Exception:
+            try:
+                _smtp_conn.close()
+            except Exception:
+                pass
+            _smtp_conn = None
+    conn = smtplib.SMTP_SSL(cfg["smtp_server"], cfg["smtp_port"])
+    conn.login(cfg["smtp_username"], cfg["smtp_password"])
+    _smtp_conn = conn
+    return conn
+
 def send_email_notification(email: EmailStr, subject: str, message: str):
     """
     Sends an email notification to the specified recipient using the current SMTP configuration.
@@ -203,8 +532,8 @@ def send_email_notification(email: EmailStr, subject: str, message: str):
         msg["Subject"] = subject
         msg["From"] = cfg["sender_email"]
         msg["To"] = email
-        with smtplib.SMTP_SSL(cfg["smtp_server"], cfg["smtp_port"]) as server:
-            server.login(cfg["smtp_username"], cfg["smtp_password"])
+        with _smtp_lock:
+            server = _smtp_connection(cfg)
             server.sendmail(cfg["sender_email"], [email], msg.as_string())
         print(f"[MAIL] Sent alert email to {email}")
         return True
@@ -213,6 +542,94 @@ def send_email_notification(email: EmailStr, subject: str, message: str):
         return False
 
 
+def _parse_timestamp(value):
+    """
+    Normalizes an ISO-8601 timestamp to a native datetime for storage.
+    BSON Dates are 8 bytes against ~25 for ISO strings, which halves the
+    timestamp index size and gives real range semantics instead of
+    lexicographic comparison. Missing or malformed values fall back to
+    the current time.
+    """
+    if isinstance(value, datetime):
+        return value
+    if value:
+        try:
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    return datetime.now()
+
+async def _resolve_location_coords(location):
+    """
+    Resolves a location name to (lat, lon) via WeatherAPI's search
+    endpoint. Called once per settings change so forecast requests can
+    pass numeric coordinates and skip upstream geocoding on every cache
+    miss. Returns None when the API key is missing or the lookup fails.
+    """
+    if not WEATHER_API_KEY or http_client is None:
+        return None
+    try:
+        response = await http_client.get(
+            "https://api.weatherapi.com/v1/search.json",
+            params={"key": WEATHER_API_KEY, "q": location}
+        )
+        if response.status_code == 200:
+            matches = response.json()
+            if matches:
+                return matches[0]["lat"], matches[0]["lon"]
+    except Exception as e:
+        print(f"Location lookup error: {e}")
+    return None
+
+def _settings_coords(settings):
+    """
+    Returns the (lat, lon) pair stored in a settings dict, or None when
+    the location has not been resolved to coordinates.
+    """
+    lat = settings.get("lat")
+    lon = settings.get("lon")
+    if lat is not None and lon is not None:
+        return lat, lon
+    return None
+
+def _weather_unavailable(location, condition="Unknown"):
+    """
+    Placeholder forecast returned when WeatherAPI is unconfigured or
+    unreachable: never predicts rain so watering logic stays conservative.
+    """
+    return {
+        "will_rain": False,
+        "rain_amount": 0,
+        "condition": condition,
+        "location": location
+    }
+
+def _cached_weather_if_fresh():
+    """
+    Returns the cached forecast when it is still inside the cache window,
+    else None. Lets callers that only need a warm cache (the /weather
+    poll) short-circuit before touching settings at all.
+    """
+    if (cached_weather and cached_weather_time is not None
+            and time.monotonic() - cached_weather_time < WEATHER_CACHE_SECONDS):
+        return cached_weather
+    return None
+
+# Constant query/projection fragments used on per-message and per-poll
+# paths, built once instead of re-allocated inside each call.
+_NO_ID = {"_id": 0}
+_LATEST_FIRST = [("timestamp", -1)]
+
+# Constant stages of the historical-data aggregation; only the $match
+# cutoff and the $limit vary per request.
+_HISTORY_GROUP_STAGE = {"$group": {
+    "_id": {"$dateTrunc": {"date": "$timestamp", "unit": "minute"}},
+    "temperature": {"$avg": "$temperature"},
+    "humidity": {"$avg": "$humidity"},
+    "light_level": {"$avg": "$light_level"}
+}}
+_HISTORY_SORT_STAGE = {"$sort": {"_id": 1}}
+
 # === Digital Twin: DigitalPlant ===
 
 class DigitalPlant:
@@ -234,45 +651,105 @@ class DigitalPlant:
         self.last_auto_watering_time = None
         self.email_callback = email_callback
         self.last_status = None
+        self.latest_evaluation = None
+        self._last_eval_reading = None
+        self._settings_cache = {}
+        self._settings_lock = threading.Lock()
+        self._sensor_buf = deque()
+        self._status_buf = deque()
+        self._buf_lock = threading.Lock()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, daemon=True, name="leafi-telemetry-flush"
+        )
+        self._flusher.start()
+        atexit.register(self.flush_telemetry)
 
     def update_sensor_data(self, data: dict):
         """
         Updates the latest sensor data and saves it in the database.
+        Publication is a whole-dict rebind (atomic under the GIL): readers
+        on the event loop always see either the old or the new reading,
+        never a half-updated dict, so no lock is needed.
         """
         self.latest_sensor_data = data
         self.store_sensor_data(data)
 
     def store_sensor_data(self, data: dict):
         """
-        Saves the provided sensor data dictionary to the MongoDB collection.
+        Queues the provided sensor data dictionary for batched persistence.
         Ensures persistence for historical and analytical purposes.
         """
+        doc = dict(data)
+        doc["timestamp"] = _parse_timestamp(doc.get("timestamp"))
+        with self._buf_lock:
+            self._sensor_buf.append(doc)
+            full = len(self._sensor_buf) >= TELEMETRY_BATCH_SIZE
+        if full:
+            self.flush_telemetry()
+
+    def _flush_loop(self):
+        """
+        Background daemon loop draining the telemetry buffers at a fixed
+        interval so samples reach MongoDB within TELEMETRY_FLUSH_SECONDS
+        even at low message rates.
+        """
+        while True:
+            time.sleep(TELEMETRY_FLUSH_SECONDS)
+            self.flush_telemetry()
+
+    def flush_telemetry(self):
+        """
+        Drains both telemetry buffers and writes them with unacknowledged
+        bulk inserts. Called by the background flusher, on full buffers,
+        and at interpreter exit so shutdown never drops queued samples.
+        """
+        with self._buf_lock:
+            sensors = list(self._sensor_buf)
+            statuses = list(self._status_buf)
+            self._sensor_buf.clear()
+            self._status_buf.clear()
+        if not sensors and not statuses:
+            return
+        fire_and_forget = WriteConcern(w=0)
         try:
-            self.db.sensor_data.insert_one(data)
+            if sensors:
+                self.db.sensor_data.with_options(
+                    write_concern=fire_and_forget
+                ).insert_many(sensors, ordered=False)
+            if statuses:
+                self.db.plant_status.with_options(
+                    write_concern=fire_and_forget
+                ).insert_many(statuses, ordered=False)
         except Exception as e:
-            print(f"Failed to store sensor data: {e}")
+            logger.error("Failed to flush telemetry: %s", e)
 
     def get_latest_sensor_data(self):
         """
         Retrieves the most recent sensor data, either from memory or the database.
-        Returns None if no data is available.
+        Returns None if no data is available. The in-memory dict is
+        published by atomic rebind and never mutated in place, so it is
+        returned as-is instead of being copied per poll.
         """
         if self.latest_sensor_data:
-            return self.latest_sensor_data.copy()
-        row = self.db.sensor_data.find_one(sort=[("timestamp", -1)])
+            return self.latest_sensor_data
+        row = self.db.sensor_data.find_one(sort=_LATEST_FIRST)
         if row:
+            timestamp = row["timestamp"]
+            if isinstance(timestamp, datetime):
+                timestamp = timestamp.isoformat()
             return {
                 "temperature": row["temperature"],
                 "humidity": row["humidity"],
                 "light_level": row["light_level"],
-                "timestamp": row["timestamp"]
+                "timestamp": timestamp
             }
         return None
 
     def update_pump_status(self, data: dict):
         """
         Updates and tracks the latest pump status information.
-        Used for monitoring irrigation activity in real-time.
+        Used for monitoring irrigation activity in real-time. Rebinds the
+        whole dict (see update_sensor_data) rather than mutating it.
         """
         self.latest_pump_status = data
 
@@ -282,21 +759,36 @@ class DigitalPlant:
         If no status is available, returns a default 'unknown' state.
         """
         if self.latest_pump_status:
-            return self.latest_pump_status.copy()
+            return self.latest_pump_status
         return {"status": "unknown", "timestamp": datetime.now().isoformat()}
 
     def get_settings(self, user_id=None):
         """
         Retrieves the plant care settings from the database for the given user.
+        Results are cached in-process for SETTINGS_CACHE_TTL seconds, so the
+        per-message and per-poll hot paths skip the Mongo round-trip.
+        Double-checked locking: the fast path reads the cache without the
+        lock (the MQTT thread and event loop both call this), and only a
+        miss serializes on the lock so concurrent misses issue one query.
         If settings are not found, returns default threshold values and location.
         """
-        try:
-            q = {"user_id": user_id} if user_id else {}
-            settings = self.db.settings.find_one(q, {"_id": 0})
-            if settings:
-                return settings
-        except Exception as e:
-            print(f"Error loading settings: {e}")
+        cached = self._settings_cache.get(user_id)
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+        with self._settings_lock:
+            cached = self._settings_cache.get(user_id)
+            if cached and time.monotonic() < cached[1]:
+                return cached[0]
+            try:
+                q = {"user_id": user_id} if user_id else {}
+                settings = self.db.settings.find_one(q, _NO_ID)
+                if settings:
+                    self._settings_cache[user_id] = (
+                        settings, time.monotonic() + SETTINGS_CACHE_TTL
+                    )
+                    return settings
+            except Exception as e:
+                logger.error("Error loading settings: %s", e)
         return {
             "min_humidity": 30,
             "max_temp": 35,
@@ -306,6 +798,32 @@ class DigitalPlant:
             "location": "Cagliari"
         }
 
+    def invalidate_settings_cache(self):
+        """
+        Drops all cached settings entries; called after a settings update
+        commits so the next read observes the new values immediately.
+        The hysteresis anchor is reset too: thresholds may have moved, so
+        the next reading must be evaluated even if the values barely changed.
+        """
+        with self._settings_lock:
+            self._settings_cache.clear()
+        self._last_eval_reading = None
+
+    # Position/light recommendation rules as (predicate, template) pairs,
+    # built once at class definition. The pairs are mutually exclusive per
+    # axis (a reading cannot be both above max and below min), so a flat
+    # scan replaces the if/elif ladders; templates format from the reading.
+    _RECOMMENDATION_RULES = (
+        (lambda d, t: d["temperature"] > t["max_temp"],
+         "Temperature too high ({temperature}°C) - move to cooler location"),
+        (lambda d, t: d["temperature"] < t["min_temp"],
+         "Temperature too low ({temperature}°C) - move to warmer location"),
+        (lambda d, t: d["light_level"] < t["min_light"],
+         "Insufficient light ({light_level}%) - move to brighter location"),
+        (lambda d, t: d["light_level"] > t["max_light"],
+         "Too much light ({light_level}%) - add shade or relocate"),
+    )
+
     def evaluate_plant_status(self, data: dict, thresholds: dict, weather_info: dict):
         """
         Evaluates the health status of the plant based on sensor readings,
@@ -328,23 +846,9 @@ class DigitalPlant:
         else:
             status = None
 
-        if data["temperature"] > thresholds["max_temp"]:
-            recommendations.append(
-                f"Temperature too high ({data['temperature']}°C) - move to cooler location"
-            )
-        elif data["temperature"] < thresholds["min_temp"]:
-            recommendations.append(
-                f"Temperature too low ({data['temperature']}°C) - move to warmer location"
-            )
-
-        if data["light_level"] < thresholds["min_light"]:
-            recommendations.append(
-                f"Insufficient light ({data['light_level']}%) - move to brighter location"
-            )
-        elif data["light_level"] > thresholds["max_light"]:
-            recommendations.append(
-                f"Too much light ({data['light_level']}%) - add shade or relocate"
-            )
+        for predicate, template in self._RECOMMENDATION_RULES:
+            if predicate(data, thresholds):
+                recommendations.append(template.format(**data))
 
         if not status:
             if not recommendations:
@@ -360,27 +864,50 @@ class DigitalPlant:
 
     def store_plant_status(self, status: str, recommendations: list, timestamp: str):
         """
-        Persists the evaluated plant status and recommendations to the database.
-        Used for historical tracking and analytics.
+        Queues the evaluated plant status and recommendations for batched
+        persistence. Used for historical tracking and analytics.
         """
-        try:
-            self.db.plant_status.insert_one({
+        with self._buf_lock:
+            self._status_buf.append({
                 "status": status,
                 "recommendations": recommendations,
-                "timestamp": timestamp
+                "timestamp": _parse_timestamp(timestamp)
             })
-        except Exception as e:
-            print(f"Failed to store plant status: {e}")
+            full = len(self._status_buf) >= TELEMETRY_BATCH_SIZE
+        if full:
+            self.flush_telemetry()
 
     def process_and_notify(self, data: dict):
         """
         Processes new sensor data, evaluates the plant's current status,
         and sends notification emails to the user if attention is required.
-        Also updates the plant status in the database.
+        Also updates the plant status in the database. Returns the
+        evaluation so callers (the MQTT handler's auto-watering branch)
+        can reuse it instead of re-fetching settings and weather.
+        Readings within the hysteresis band of the last evaluated one
+        reuse the previous evaluation outright, skipping the weather
+        lookup, the rule pass and the plant_status write.
         """
+        reading = (data["temperature"], data["humidity"], data["light_level"])
+        last = self._last_eval_reading
+        if (last is not None and self.latest_evaluation is not None
+                and abs(reading[0] - last[0]) < HYSTERESIS_TEMP
+                and abs(reading[1] - last[1]) < HYSTERESIS_HUMIDITY
+                and abs(reading[2] - last[2]) < HYSTERESIS_LIGHT):
+            self.latest_evaluation = dict(
+                self.latest_evaluation, timestamp=data.get("timestamp")
+            )
+            return self.latest_evaluation
+
         thresholds = self.get_settings()
-        weather_info = self.get_weather_forecast(thresholds["location"])
+        weather_info = self.get_weather_forecast_sync(
+            thresholds["location"], _settings_coords(thresholds)
+        )
         evaluation = self.evaluate_plant_status(data, thresholds, weather_info)
+        # Snapshot keyed by the reading's timestamp so /current-status can
+        # serve this evaluation instead of recomputing it per poll.
+        self.latest_evaluation = dict(evaluation, timestamp=data.get("timestamp"))
+        self._last_eval_reading = reading
         now_status = evaluation["status"]
         negative_states = {"Needs water", "Change position", "No data"}
 
@@ -426,63 +953,84 @@ LeaFi
                 self.email_callback(user_email, subject, message)
         self.last_status = now_status
 
+        # or-fallback instead of a .get default: dict.get builds its
+        # default eagerly, which cost a datetime.now().isoformat() per
+        # message even though MQTT ingest always backfills the timestamp.
         self.store_plant_status(
             now_status,
             evaluation["recommendations"],
-            data.get("timestamp", datetime.now().isoformat())
+            data.get("timestamp") or datetime.now().isoformat()
         )
+        return evaluation
 
-    def get_weather_forecast(self, location):
+    async def get_weather_forecast(self, location, coords=None):
         """
         Retrieves weather forecast data for the given location using the WeatherAPI.
         Caches results to minimize API calls. Returns rain prediction and conditions.
+        Runs on the event loop via the shared async HTTP client, so a slow
+        upstream no longer blocks concurrent requests for up to 10 seconds.
+        When (lat, lon) coordinates are provided they are sent instead of
+        the location name, letting WeatherAPI skip its geocoding step.
         """
         global cached_weather, cached_weather_time, WEATHER_API_KEY
         if not WEATHER_API_KEY:
-            return {
-                "will_rain": False,
-                "rain_amount": 0,
-                "condition": "API not configured",
-                "location": location
-            }
-        now = datetime.now()
-        if (cached_weather and cached_weather_time and
-                (now - cached_weather_time) < WEATHER_CACHE_DURATION):
-            return cached_weather
-
-        try:
-            url = "https://api.weatherapi.com/v1/forecast.json"
-            params = {
-                "key": WEATHER_API_KEY,
-                "q": location,
-                "days": 1,
-                "aqi": "no",
-                "alerts": "no"
-            }
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                forecast_day = data["forecast"]["forecastday"][0]["day"]
-                will_rain = forecast_day["daily_will_it_rain"] == 1
-                rain_amount = forecast_day["totalprecip_mm"]
-                condition = data["current"]["condition"]["text"]
-                result = {
-                    "will_rain": will_rain,
-                    "rain_amount": rain_amount,
-                    "condition": condition,
-                    "location": location
+            return _weather_unavailable(location, "API not configured")
+        cached = _cached_weather_if_fresh()
+        if cached:
+            return cached
+
+        async with _weather_fetch_lock:
+            # Re-check under the lock: waiters piled up behind the first
+            # cache miss find the result it just stored and return without
+            # their own upstream call.
+            cached = _cached_weather_if_fresh()
+            if cached:
+                return cached
+            try:
+                url = "https://api.weatherapi.com/v1/forecast.json"
+                params = {
+                    "key": WEATHER_API_KEY,
+                    "q": f"{coords[0]},{coords[1]}" if coords else location,
+                    "days": 1,
+                    "aqi": "no",
+                    "alerts": "no"
                 }
-                cached_weather = result
-                cached_weather_time = now
-                return result
-        except Exception as e:
-            print(f"Weather API error: {e}")
-        return {
-            "will_rain": False,
-            "rain_amount": 0,
-            "condition": "Unknown",
-            "location": location
-        }
+                response = await http_client.get(url, params=params)
+                if response.status_code == 200:
+                    data = response.json()
+                    forecast_day = data["forecast"]["forecastday"][0]["day"]
+                    will_rain = forecast_day["daily_will_it_rain"] == 1
+                    rain_amount = forecast_day["totalprecip_mm"]
+                    condition = data["current"]["condition"]["text"]
+                    result = {
+                        "will_rain": will_rain,
+                        "rain_amount": rain_amount,
+                        "condition": condition,
+                        "location": location
+                    }
+                    cached_weather = result
+                    cached_weather_time = time.monotonic()
+                    return result
+            except Exception as e:
+                logger.warning("Weather API error: %s", e)
+        return _weather_unavailable(location)
+
+    def get_weather_forecast_sync(self, location, coords=None):
+        """
+        Synchronous bridge for callers on the MQTT thread: schedules
+        get_weather_forecast onto the FastAPI event loop and waits for
+        the result. Returns the unavailable placeholder if the loop is
+        not running yet (e.g. messages arriving during startup).
+        """
+        if MAIN_LOOP is not None:
+            future = asyncio.run_coroutine_threadsafe(
+                self.get_weather_forecast(location, coords), MAIN_LOOP
+            )
+            try:
+                return future.result(timeout=15)
+            except Exception as e:
+                print(f"Weather API error: {e}")
+        return _weather_unavailable(location)
 
     def can_auto_water(self, evaluation):
         """
@@ -491,12 +1039,12 @@ LeaFi
         """
         global last_auto_watering_time
         can_water = evaluation["should_water"]
-        now = datetime.now()
+        now = time.monotonic()
         if can_water:
-            if last_auto_watering_time:
+            if last_auto_watering_time is not None:
                 elapsed = now - last_auto_watering_time
-                if elapsed < AUTO_WATERING_COOLDOWN:
-                    print("[AUTO] Cooldown in effect, skipping irrigation")
+                if elapsed < AUTO_WATERING_COOLDOWN_SECONDS:
+                    logger.info("[AUTO] Cooldown in effect, skipping irrigation")
                     can_water = False
             if can_water:
                 last_auto_watering_time = now
@@ -511,8 +1059,11 @@ LeaFi
             "action": "water",
             "reason": "auto"
         }
-        mqtt_client.publish(MQTT_TOPICS["command"], json.dumps(command), qos=1)
-        print(f"[AUTO] Auto irrigation triggered at {datetime.now().isoformat()}")
+        # QoS 0: watering commands are re-issuable and the device reports
+        # back on the pump topic, so a lost command is visible without
+        # waiting on a PUBACK handshake.
+        mqtt_client.publish(MQTT_TOPICS["command"], orjson.dumps(command), qos=0)
+        logger.info("[AUTO] Auto irrigation triggered")
         if user_email and self.email_callback:
             self.email_callback(
                 user_email,
@@ -526,42 +1077,93 @@ plant = DigitalPlant(db=db, email_callback=send_email_notification)
 
 # === MQTT Client Setup and Handlers ===
 
+# Post-decode work (evaluation, notifications, auto-watering) runs on
+# this single-worker pool instead of paho's network loop thread, so a
+# slow weather fetch cannot stall dispatch of the next packet or trip
+# the broker keepalive. One worker keeps messages processed in arrival
+# order.
+_mqtt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leafi-mqtt")
+
+
+def _process_sensor_message(data):
+    """
+    Evaluates a decoded sensor reading and drives notifications and the
+    auto-watering decision. Runs on the MQTT worker pool; exceptions are
+    logged here because the executor would otherwise swallow them.
+    """
+    try:
+        evaluation = plant.process_and_notify(data)
+        # Reuses the evaluation computed above: one settings read and one
+        # weather lookup per message instead of two of each. The user
+        # lookup only runs when watering will actually be triggered.
+        if (device_commands.get("auto_watering_enabled")
+                and plant.can_auto_water(evaluation)):
+            user_row = db.users.find_one()
+            user_email = user_row.get("email") if user_row else None
+            plant.trigger_auto_watering(mqtt_client, user_email=user_email)
+    except Exception as e:
+        logger.error("Error processing sensor message: %s", e)
+
+
 def on_connect(client, userdata, flags, rc, properties=None):
     """
     MQTT connection event handler.
     Subscribes to sensor and pump topics upon successful connection to broker.
     Provides feedback on connection result code.
     """
-    print(f"[MQTT] Connected with result code {rc}")
+    logger.info("[MQTT] Connected with result code %s", rc)
     client.subscribe(MQTT_TOPICS["sensor"], qos=1)
     client.subscribe(MQTT_TOPICS["pump"], qos=1)
 
 
+def on_socket_open(client, userdata, sock):
+    """
+    Socket setup hook: disables Nagle's algorithm so small publishes
+    (watering commands are ~40 bytes) leave immediately instead of
+    waiting to coalesce with traffic that never comes.
+    """
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError:
+        pass
+
+
+def on_publish(client, userdata, mid):
+    """
+    MQTT publish confirmation handler. Command publishes are
+    fire-and-forget on the caller side; broker confirms arrive here
+    asynchronously instead of being waited on in request handlers.
+    """
+    logger.debug("[MQTT] Publish confirmed (mid=%s)", mid)
+
+
 def on_message(client, userdata, msg):
     topic = msg.topic
-    payload = msg.payload.decode()
-    print(f"[MQTT] Message received: {topic}\n{payload}")
-    try:
-        data = json.loads(payload)
-    except Exception as e:
-        print(f"[MQTT] Error decoding JSON: {e}")
-        return
+    logger.debug("[MQTT] Message received: %s %s", topic, msg.payload)
 
     if topic == MQTT_TOPICS["sensor"]:
+        # Parse and range-validate in one pydantic-core pass instead of
+        # json.loads followed by unchecked dict access; pydantic accepts
+        # the raw bytes, so no intermediate .decode() string is built.
+        try:
+            data = SensorData.model_validate_json(msg.payload).model_dump()
+        except Exception as e:
+            logger.warning("[MQTT] Invalid sensor payload: %s", e)
+            return
+        if not data.get("timestamp"):
+            data["timestamp"] = datetime.now().isoformat()
+        # Publish the latest reading inline (cheap dict rebind), then hand
+        # the evaluation/notification/auto-watering work to the worker
+        # pool so this callback returns to the network loop immediately.
         plant.update_sensor_data(data)
-        plant.process_and_notify(data)
-
-        # -- AUTO-WATERING LOGIC (event-driven) --
-        if device_commands.get("auto_watering_enabled"):
-            user_row = db.users.find_one()
-            user_email = user_row.get("email") if user_row else None
-            thresholds = plant.get_settings()
-            weather_info = plant.get_weather_forecast(thresholds["location"])
-            evaluation = plant.evaluate_plant_status(data, thresholds, weather_info)
-            if plant.can_auto_water(evaluation):
-                plant.trigger_auto_watering(mqtt_client, user_email=user_email)
+        _mqtt_executor.submit(_process_sensor_message, data)
 
     elif topic == MQTT_TOPICS["pump"]:
+        try:
+            data = orjson.loads(msg.payload)
+        except Exception as e:
+            logger.warning("[MQTT] Error decoding JSON: %s", e)
+            return
         plant.update_pump_status(data)
 
 def start_mqtt():
@@ -574,8 +1176,15 @@ def start_mqtt():
     if MQTT_TLS:
         client.tls_set()
         client.tls_insecure_set(True)
+    # Let queued publishes pipeline instead of trickling out one PUBACK
+    # at a time, and bound the outbound queue so a broker outage cannot
+    # grow it without limit (commands are re-issuable anyway).
+    client.max_inflight_messages_set(20)
+    client.max_queued_messages_set(100)
     client.on_connect = on_connect
     client.on_message = on_message
+    client.on_publish = on_publish
+    client.on_socket_open = on_socket_open
     client.connect(MQTT_BROKER, MQTT_PORT, 60)
     client.loop_start()
     return client
@@ -585,14 +1194,24 @@ mqtt_client = start_mqtt()
 # === API Endpoints ===
 
 @app.post("/LeaFi/auth/login")
-async def login(user: UserLogin):
+async def login(user: UserLogin, request: Request):
     """
     Authenticates a user with username and password.
     Returns a JWT access token if credentials are valid.
     Used for secure access to protected API endpoints.
+    Limited to 5 attempts per client IP per minute so a burst of POSTs
+    cannot pin a CPU core with bcrypt verifications.
     """
-    db_user = db.users.find_one({"username": user.username})
-    if not db_user or not verify_password(user.password, db_user["password_hash"]):
+    client_ip = request.client.host if request.client else "unknown"
+    enforce_rate_limit(f"login:{client_ip}", max_calls=5, window_seconds=60)
+    # The Mongo lookup and bcrypt verification (~100ms by design) both
+    # block; run them on the worker threadpool so the event loop keeps
+    # serving other requests meanwhile. Unknown usernames verify against
+    # the dummy hash so both outcomes cost one bcrypt check.
+    db_user = await asyncio.to_thread(db.users.find_one, {"username": user.username})
+    stored_hash = db_user["password_hash"] if db_user else _DUMMY_HASH
+    password_ok = await asyncio.to_thread(verify_password, user.password, stored_hash)
+    if not (password_ok and db_user):
         raise HTTPException(status_code=401, detail="Invalid username or password")
     access_token = create_access_token(data={"sub": user.username})
     print(f"User authenticated: {user.username}")
@@ -608,16 +1227,26 @@ async def register(user: UserRegister):
     Stores credentials and initializes default plant settings.
     Ensures unique username and email address.
     """
-    if db.users.find_one({"username": user.username}) or db.users.find_one({"email": user.email}):
+    # One $or lookup replaces the two separate uniqueness probes, and all
+    # blocking work (Mongo round-trips, bcrypt) runs off the event loop.
+    existing = await asyncio.to_thread(
+        db.users.find_one,
+        {"$or": [{"username": user.username}, {"email": user.email}]}
+    )
+    if existing:
         raise HTTPException(status_code=400, detail="Username or email already exists")
-    password_hash = bcrypt.hashpw(user.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-    db.users.insert_one({
+    hash_bytes = await asyncio.to_thread(
+        bcrypt.hashpw, user.password.encode('utf-8'),
+        bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    )
+    password_hash = hash_bytes.decode('utf-8')
+    await asyncio.to_thread(db.users.insert_one, {
         "username": user.username,
         "password_hash": password_hash,
         "email": user.email,
         "created_at": datetime.now()
     })
-    db.settings.insert_one({
+    await asyncio.to_thread(db.settings.insert_one, {
         "user_id": user.username,
         "min_humidity": 30,
         "max_temp": 35,
@@ -634,7 +1263,8 @@ async def set_email_config(config: EmailConfig, current_user: str = Depends(get_
     Sets or updates the SMTP email configuration for notifications.
     Accessible only to authenticated users.
     """
-    db.config.update_one(
+    await asyncio.to_thread(
+        db.config.update_one,
         {"type": "email"},
         {"$set": dict(config, type="email")},
         upsert=True
@@ -642,11 +1272,14 @@ async def set_email_config(config: EmailConfig, current_user: str = Depends(get_
     return {"status": "success", "message": "Email configuration updated"}
 
 @app.get("/LeaFi/current-status")
-async def get_current_status():
+async def get_current_status(response: Response):
     """
     Retrieves the latest plant sensor data, evaluated status, recommendations,
     and current pump state. Used for dashboard display and monitoring.
+    A short Cache-Control lifetime lets browsers skip redundant polls
+    between sensor updates.
     """
+    response.headers["Cache-Control"] = "private, max-age=5"
     data = plant.get_latest_sensor_data()
     pump = plant.get_latest_pump_status()
     if not data:
@@ -660,9 +1293,15 @@ async def get_current_status():
             "auto_watering_enabled": device_commands["auto_watering_enabled"],
             "pump_status": pump
         }
-    thresholds = plant.get_settings()
-    weather_info = plant.get_weather_forecast(thresholds["location"])
-    evaluation = plant.evaluate_plant_status(data, thresholds, weather_info)
+    evaluation = plant.latest_evaluation
+    if not evaluation or evaluation.get("timestamp") != data["timestamp"]:
+        # Cache miss (restart, or data loaded from the DB fallback):
+        # evaluate from scratch as before.
+        thresholds = plant.get_settings()
+        weather_info = await plant.get_weather_forecast(
+            thresholds["location"], _settings_coords(thresholds)
+        )
+        evaluation = plant.evaluate_plant_status(data, thresholds, weather_info)
     return {
         "temperature": data["temperature"],
         "humidity": data["humidity"],
@@ -675,44 +1314,85 @@ async def get_current_status():
     }
 
 @app.get("/LeaFi/historical-data")
-async def get_historical_data(hours: int = 24, current_user: str = Depends(get_current_user)):
+async def get_historical_data(response: Response, hours: int = 24, limit: int = 1500,
+                              current_user: str = Depends(get_current_user)):
     """
     Returns historical sensor data records for the specified time range (in hours).
     Used for charting and analytics purposes in the frontend.
-    Requires user authentication.
+    Requires user authentication. The limit parameter bounds the number of
+    returned buckets (capped at 5000) so a large hours value cannot make
+    the server materialize an unbounded response; a short Cache-Control
+    lifetime absorbs chart re-renders without a fresh aggregation.
     """
+    response.headers["Cache-Control"] = "private, max-age=30"
+    limit = max(1, min(limit, 5000))
     cutoff_time = datetime.now() - timedelta(hours=hours)
-    cutoff_iso = cutoff_time.isoformat()
-    data = list(db.sensor_data.find(
-        {"timestamp": {"$gt": cutoff_iso}},
-        {"_id": 0, "temperature": 1, "humidity": 1, "light_level": 1, "timestamp": 1}
-    ).sort("timestamp", 1))
+    # Downsample server-side: readings are averaged into one-minute buckets
+    # by the aggregation pipeline, bounding the response at ~1440 rows per
+    # day regardless of how densely the device reports, instead of
+    # materializing and serializing every raw document.
+    pipeline = [
+        {"$match": {"timestamp": {"$gt": cutoff_time}}},
+        _HISTORY_GROUP_STAGE,
+        _HISTORY_SORT_STAGE,
+        {"$limit": limit}
+    ]
+    def run_pipeline():
+        # aggregate() issues the command immediately, so the whole fetch
+        # runs on the worker threadpool instead of blocking the event loop.
+        # batchSize=limit returns the (already bounded) result in a single
+        # batch instead of a 101-document first batch plus getMore
+        # round-trips.
+        return list(db.sensor_data.aggregate(pipeline, batchSize=limit))
+
+    data = [
+        {
+            "temperature": row["temperature"],
+            "humidity": row["humidity"],
+            "light_level": row["light_level"],
+            "timestamp": row["_id"].isoformat()
+        }
+        for row in await asyncio.to_thread(run_pipeline)
+    ]
     print(f"Historical data request by {current_user} - {len(data)} records ({hours}h)")
     return {"data": data}
 
 @app.get("/LeaFi/weather")
-async def get_weather():
+async def get_weather(response: Response):
     """
     Provides the current weather forecast for the plant's configured location.
-    Integrates external WeatherAPI data.
+    Integrates external WeatherAPI data. The client-facing Cache-Control
+    lifetime stays short regardless of the 3-hour server-side cache window:
+    a location change invalidates the server cache immediately, and clients
+    must revalidate soon after to pick the new forecast up.
     """
-    settings = plant.get_settings()
-    return plant.get_weather_forecast(settings["location"])
+    forecast = _cached_weather_if_fresh()
+    if forecast is None:
+        # Cache miss: only now is the settings read (for the location)
+        # actually needed.
+        settings = plant.get_settings()
+        forecast = await plant.get_weather_forecast(
+            settings["location"], _settings_coords(settings)
+        )
+    response.headers["Cache-Control"] = "private, max-age=30"
+    return forecast
 
 @app.post("/LeaFi/manual-water")
 async def manual_water(current_user: str = Depends(get_current_user)):
     """
     Sends a manual watering command to the plant device via MQTT.
     Updates the last watering timestamp and logs the action.
-    Requires authentication.
+    Requires authentication. Limited per user so a stuck dashboard retry
+    loop cannot flood the broker with pump commands.
     """
     global last_auto_watering_time
+    enforce_rate_limit(f"water:{current_user}", max_calls=6, window_seconds=60)
     command = {
         "action": "water",
         "reason": "manual"
     }
-    mqtt_client.publish(MQTT_TOPICS["command"], json.dumps(command), qos=1)
-    last_auto_watering_time = datetime.now()
+    mqtt_client.publish(MQTT_TOPICS["command"], orjson.dumps(command), qos=0)
+    last_auto_watering_time = time.monotonic()
     print(f"[MQTT] Manual watering triggered by user: {current_user}")
     return {
         "status": "success",
@@ -727,8 +1407,12 @@ async def toggle_auto_watering(current_user: str = Depends(get_current_user)):
     Requires authentication.
     """
     global device_commands
-    device_commands["auto_watering_enabled"] = not device_commands["auto_watering_enabled"]
-    status = "enabled" if device_commands["auto_watering_enabled"] else "disabled"
+    # Rebind the whole dict rather than mutating in place, matching the
+    # snapshot pattern used for sensor/pump state: the MQTT worker reads
+    # this global and must never observe a partially updated dict.
+    enabled = not device_commands["auto_watering_enabled"]
+    device_commands = {"auto_watering_enabled": enabled}
+    status = "enabled" if enabled else "disabled"
     print(f"Auto-watering {status} by user: {current_user}")
     return {
         "status": "success",
@@ -754,12 +1438,29 @@ async def update_settings(settings: ThresholdUpdate, current_user: str = Depends
     global cached_weather_time, cached_weather
     try:
         old_settings = plant.get_settings(user_id=current_user)
-        update_result = db.settings.update_one(
+        update_doc = settings.dict()
+        location_changed = old_settings.get("location") != settings.location
+        if location_changed or _settings_coords(old_settings) is None:
+            # Resolve the location to coordinates once here so forecast
+            # requests can skip WeatherAPI's geocoding from now on.
+            coords = await _resolve_location_coords(settings.location)
+            if coords:
+                update_doc["lat"], update_doc["lon"] = coords
+        update = {"$set": update_doc}
+        if location_changed and "lat" not in update_doc:
+            # Resolution failed for the new location: drop stale coords so
+            # forecasts fall back to the location name.
+            update["$unset"] = {"lat": "", "lon": ""}
+        update_result = await asyncio.to_thread(
+            db.settings.update_one,
             {"user_id": current_user},
-            {"$set": settings.dict()}
+            update
         )
         if update_result.matched_count == 0:
-            db.settings.insert_one(dict(settings, user_id=current_user))
+            await asyncio.to_thread(
+                db.settings.insert_one, dict(update_doc, user_id=current_user)
+            )
+        plant.invalidate_settings_cache()
         if old_settings["location"] != settings.location:
             cached_weather_time = None
             cached_weather = None
@@ -778,31 +1479,56 @@ async def health_check():
     """
     Endpoint for checking backend server health and configuration status.
     Returns timestamp, weather API state, and auto-watering flag.
+    Health probes arrive at heartbeat rates, so the JSON is assembled
+    from constant byte fragments and returned as a raw Response,
+    bypassing dict allocation and the response serializer entirely.
     """
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "weather_api": "configured" if WEATHER_API_KEY else "not configured",
-        "auto_watering": device_commands["auto_watering_enabled"]
-    }
+    body = (
+        b'{"status":"healthy","timestamp":"'
+        + datetime.now().isoformat().encode()
+        + b'","weather_api":"'
+        + (b"configured" if WEATHER_API_KEY else b"not configured")
+        + b'","auto_watering":'
+        + (b"true" if device_commands["auto_watering_enabled"] else b"false")
+        + b"}"
+    )
+    return Response(content=body, media_type="application/json")
 
 # === Static Files and Web Interface ===
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles variant that marks responses cacheable. The dashboard's
+    JS/CSS only change with deployments, so clients may keep them for a
+    day instead of re-requesting per page load.
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=86400"
+        return response
+
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 
 @app.get("/")
 async def dashboard():
     """
     Serves the main HTML dashboard page for the LeaFi web interface.
     """
-    return FileResponse('templates/index.html')
+    return FileResponse(
+        'templates/index.html',
+        headers={"Cache-Control": "public, max-age=300"}
+    )
 
 @app.get("/login")
 async def login_page():
     """
     Serves the login HTML page for users to access their LeaFi account.
     """
-    return FileResponse('templates/login.html')
+    return FileResponse(
+        'templates/login.html',
+        headers={"Cache-Control": "public, max-age=300"}
+    )
 
 # === Application Startup and Weather API Configuration ===
 
@@ -851,6 +1577,11 @@ if __name__ == "__main__":
             reload=False,
             access_log=True,
             log_level="info",
+            # "auto" picks uvloop (libuv event loop) and httptools (C HTTP
+            # parser) when installed — see requirements.txt — and falls back
+            # to the pure-Python implementations on Windows dev machines.
+            loop="auto",
+            http="auto",
             ssl_certfile="certs/cert.pem",
             ssl_keyfile="certs/key.pem"
         )